@@ -1,65 +1,204 @@
 """iCal file generator for Octopus Energy free electricity sessions."""
 
+import copy
+import hashlib
 import logging
+import re
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List
-from icalendar import Calendar, Event, Alarm, vText
+from typing import TYPE_CHECKING, List
 from session_parser import Session
 
+if TYPE_CHECKING:
+    from icalendar import Alarm
+
 
 logger = logging.getLogger(__name__)
 
+# Constant property values shared by every event
+PRODID = '-//Octopus Energy Free Electricity//EN'
+CALENDAR_NAME = 'Octopus Free Electricity'
+EVENT_SUMMARY = 'Octopus Free Electricity'
+EVENT_LOCATION = 'UK'
+EVENT_STATUS = 'CONFIRMED'
+EVENT_TRANSP = 'TRANSPARENT'
+EVENT_CATEGORIES = 'Free Electricity,Octopus Energy'
+CALENDAR_DESC = 'Free electricity sessions from Octopus Energy'
+PLACEHOLDER_DESC = 'No free electricity sessions are currently scheduled.'
+
+# RFC 5545 text escaping
+_ICAL_ESCAPE = str.maketrans({'\\': '\\\\', ';': '\\;', ',': '\\,', '\n': '\\n', '\r': ''})
+
+# RFC 5545 content lines should not be longer than 75 octets
+_FOLD_LIMIT = 75
+
+# DTSTAMP changes on every run, so it is ignored when comparing file contents
+_DTSTAMP_RE = re.compile(rb'^DTSTAMP:[^\r\n]*\r?\n', re.MULTILINE)
+
+_CALENDAR_HEAD = (
+    'BEGIN:VCALENDAR\r\n'
+    'VERSION:2.0\r\n'
+    f'PRODID:{PRODID}\r\n'
+    'CALSCALE:GREGORIAN\r\n'
+    'METHOD:PUBLISH\r\n'
+)
+_CALENDAR_FOOT = 'END:VCALENDAR\r\n'
+
+_EVENT_TEMPLATE = (
+    'BEGIN:VEVENT\r\n'
+    f'SUMMARY:{EVENT_SUMMARY.translate(_ICAL_ESCAPE)}\r\n'
+    'DTSTART:{start}\r\n'
+    'DTEND:{end}\r\n'
+    'DTSTAMP:{dtstamp}\r\n'
+    'UID:{uid}\r\n'
+    f'CATEGORIES:{EVENT_CATEGORIES.translate(_ICAL_ESCAPE)}\r\n'
+    '{description}\r\n'
+    f'LOCATION:{EVENT_LOCATION.translate(_ICAL_ESCAPE)}\r\n'
+    f'STATUS:{EVENT_STATUS}\r\n'
+    f'TRANSP:{EVENT_TRANSP}\r\n'
+    '{alarms}'
+    'END:VEVENT\r\n'
+)
+
+
+def _content_hash(data: bytes) -> bytes:
+    """Hash iCal data, ignoring DTSTAMP lines."""
+    return hashlib.blake2b(_DTSTAMP_RE.sub(b'', data), digest_size=16).digest()
+
+
+def _alarm_description(minutes: int) -> str:
+    """Get the alarm description for an alarm the given minutes before a session."""
+    if minutes == 0:
+        return 'Free electricity session starting NOW!'
+    elif minutes < 60:
+        return f'Free electricity session in {minutes} minutes!'
+    else:
+        hours = minutes // 60
+        return f'Free electricity session in {hours} hour{"s" if hours > 1 else ""}!'
 
-class ICalGenerator:
-    """Generator for iCal calendar files."""
 
-    def __init__(self, timezone: str = 'GMT', alarms_enabled: bool = True, alarm_times: List[int] = None):
+def _format_trigger(minutes: int) -> str:
+    """Format an alarm trigger as an RFC 5545 duration (negative = before event)."""
+    sign = '-' if minutes > 0 else ''
+    days, rem = divmod(abs(minutes), 1440)
+    hours, mins = divmod(rem, 60)
+
+    duration = 'P'
+    if days:
+        duration += f'{days}D'
+    if hours or mins:
+        duration += 'T'
+        if hours:
+            duration += f'{hours}H'
+        if mins:
+            duration += f'{mins}M'
+    if duration == 'P':
+        duration = 'P0D'
+    return sign + duration
+
+
+def _fold(line: str) -> str:
+    """Fold a content line into physical lines shorter than 75 octets (as icalendar does)."""
+    if len(line) < _FOLD_LIMIT and line.isascii():
+        return line
+
+    parts = []
+    current: List[str] = []
+    size = 0
+    for ch in line:
+        n = len(ch.encode('utf-8'))
+        if current and size + n >= _FOLD_LIMIT:
+            # Don't split a backslash escape across lines
+            if len(current) > 1 and current[-1] == '\\':
+                current.pop()
+                parts.append(''.join(current))
+                current = ['\\']
+                size = 1
+            else:
+                parts.append(''.join(current))
+                current = []
+                size = 0
+        current.append(ch)
+        size += n
+    parts.append(''.join(current))
+
+    # Continuation lines start with a single space
+    return '\r\n '.join(parts)
+
+
+class _ICalendarBuilder:
+    """Builds calendars with the icalendar library (slower fallback path)."""
+
+    def __init__(self, timezone: str, alarm_times: List[int]):
         """
-        Initialize iCal generator.
+        Initialize builder.
 
         Args:
             timezone: Timezone for events
-            alarms_enabled: Whether to add alarms to events
-            alarm_times: List of minutes before event to add alarms (e.g., [60, 15, 0])
+            alarm_times: List of minutes before event to add alarms
         """
-        self.timezone = timezone
-        self.alarms_enabled = alarms_enabled
-        self.alarm_times = alarm_times or [60, 15, 0]
+        # Imported here so the default writer doesn't pay for loading icalendar
+        import icalendar
+        self._icalendar = icalendar
+        vText = icalendar.vText
 
-    def generate(self, sessions: List[Session], output_path: Path) -> bool:
+        # Constant property values shared by every event
+        self._summary = vText(EVENT_SUMMARY)
+        self._location = vText(EVENT_LOCATION)
+        self._status = vText(EVENT_STATUS)
+        self._transp = vText(EVENT_TRANSP)
+        self._categories = vText(EVENT_CATEGORIES)
+        self._calendar_desc = vText(CALENDAR_DESC)
+        self._placeholder_desc = vText(PLACEHOLDER_DESC)
+
+        # Calendar-level properties never change, so build them once
+        self._cal_template = icalendar.Calendar()
+        self._cal_template.add('prodid', PRODID)
+        self._cal_template.add('version', '2.0')
+        self._cal_template.add('calscale', 'GREGORIAN')
+        self._cal_template.add('method', 'PUBLISH')
+        self._cal_template.add('x-wr-calname', vText(CALENDAR_NAME))
+        self._cal_template.add('x-wr-timezone', vText(timezone))
+
+        # Alarms are identical for every event, so build them once as well
+        self._alarm_templates: List["Alarm"] = []
+        for minutes in alarm_times:
+            alarm = icalendar.Alarm()
+            alarm.add('action', vText('DISPLAY'))
+            alarm.add('description', vText(_alarm_description(minutes)))
+
+            # Set trigger as timedelta (negative for before the event)
+            if minutes == 0:
+                trigger = timedelta(0)  # At start time
+            else:
+                trigger = -timedelta(minutes=minutes)  # Negative = before event
+
+            alarm.add('trigger', trigger)
+
+            self._alarm_templates.append(alarm)
+
+    def build(self, sessions: List[Session]) -> bytes:
         """
-        Generate iCal file from sessions.
+        Build iCal data from sessions.
 
         Args:
             sessions: List of Session objects
-            output_path: Path to save iCal file
 
         Returns:
-            True if successful, False otherwise
+            Serialized calendar
         """
-
-        # Create calendar
-        cal = Calendar()
-        cal.add('prodid', '-//Octopus Energy Free Electricity//EN')
-        cal.add('version', '2.0')
-        cal.add('calscale', 'GREGORIAN')
-        cal.add('method', 'PUBLISH')
-        cal.add('x-wr-calname', vText('Octopus Free Electricity'))
-        cal.add('x-wr-timezone', vText(self.timezone))
-        if sessions:
-            description = 'Free electricity sessions from Octopus Energy'
-        else:
-            description = 'No free electricity sessions are currently scheduled.'
-            logger.info("Generating placeholder iCal file with no sessions")
-        cal.add('x-wr-caldesc', vText(description))
+        # Create calendar from the template (copy shares the subcomponent list)
+        cal = copy.copy(self._cal_template)
+        cal.subcomponents = []
+        cal.add('x-wr-caldesc', self._calendar_desc if sessions else self._placeholder_desc)
 
         # Add events for each session
         for session in sessions:
-            event = Event()
+            event = self._icalendar.Event()
 
             # Set event properties
-            event.add('summary', vText('Octopus Free Electricity'))
+            event.add('summary', self._summary)
             event.add('dtstart', session.start_time)
             event.add('dtend', session.end_time)
             event.add('dtstamp', datetime.now())
@@ -74,55 +213,151 @@ class ICalGenerator:
                 f"Duration: {session.duration}\n"
                 f"Make sure to use electricity during this period!"
             )
-            event.add('description', vText(description))
+            event.add('description', self._icalendar.vText(description))
 
             # Add location
-            event.add('location', vText('UK'))
+            event.add('location', self._location)
 
             # Add status and other properties
-            event.add('status', vText('CONFIRMED'))
-            event.add('transp', vText('TRANSPARENT'))
+            event.add('status', self._status)
+            event.add('transp', self._transp)
 
             # Add categories
-            event.add('categories', vText('Free Electricity,Octopus Energy'))
+            event.add('categories', self._categories)
 
             # Add alarms if enabled
-            if self.alarms_enabled and self.alarm_times:
-                for minutes in self.alarm_times:
-                    alarm = Alarm()
-                    alarm.add('action', vText('DISPLAY'))
+            for alarm in self._alarm_templates:
+                event.add_component(copy.copy(alarm))
 
-                    # Custom description based on timing
-                    if minutes == 0:
-                        alarm_desc = 'Free electricity session starting NOW!'
-                    elif minutes < 60:
-                        alarm_desc = f'Free electricity session in {minutes} minutes!'
-                    else:
-                        hours = minutes // 60
-                        alarm_desc = f'Free electricity session in {hours} hour{"s" if hours > 1 else ""}!'
+            # Add event to calendar
+            cal.add_component(event)
+            logger.debug(f"Added event for session: {session.session_str}")
 
-                    alarm.add('description', vText(alarm_desc))
+        return cal.to_ical()
 
-                    # Set trigger as timedelta (negative for before the event)
-                    if minutes == 0:
-                        trigger = timedelta(0)  # At start time
-                    else:
-                        trigger = -timedelta(minutes=minutes)  # Negative = before event
 
-                    alarm.add('trigger', trigger)
+class ICalGenerator:
+    """Generator for iCal calendar files."""
 
-                    event.add_component(alarm)
-                    logger.debug(f"Added {minutes}-minute alarm for session: {session.session_str}")
+    def __init__(
+        self,
+        timezone: str = 'GMT',
+        alarms_enabled: bool = True,
+        alarm_times: List[int] = None,
+        use_icalendar: bool = False
+    ):
+        """
+        Initialize iCal generator.
 
-            # Add event to calendar
-            cal.add_component(event)
+        Args:
+            timezone: Timezone for events
+            alarms_enabled: Whether to add alarms to events
+            alarm_times: List of minutes before event to add alarms (e.g., [60, 15, 0])
+            use_icalendar: Build the file with the icalendar library instead of
+                writing it directly
+        """
+        self.timezone = timezone
+        self.alarms_enabled = alarms_enabled
+        self.alarm_times = alarm_times or [60, 15, 0]
+        self.use_icalendar = use_icalendar
+
+        active_alarm_times = self.alarm_times if self.alarms_enabled else []
+
+        # Calendar header and alarm blocks never change, so render them once
+        self._calendar_name_line = _fold(
+            f'X-WR-CALNAME:{CALENDAR_NAME.translate(_ICAL_ESCAPE)}'
+        ) + '\r\n'
+        self._timezone_line = _fold(
+            f'X-WR-TIMEZONE:{self.timezone.translate(_ICAL_ESCAPE)}'
+        ) + '\r\n'
+        self._alarms_block = ''.join(
+            'BEGIN:VALARM\r\n'
+            'ACTION:DISPLAY\r\n'
+            f'{_fold("DESCRIPTION:" + _alarm_description(minutes).translate(_ICAL_ESCAPE))}\r\n'
+            f'TRIGGER:{_format_trigger(minutes)}\r\n'
+            'END:VALARM\r\n'
+            for minutes in active_alarm_times
+        )
+
+        self._builder = _ICalendarBuilder(self.timezone, active_alarm_times) if use_icalendar else None
+
+    def _build(self, sessions: List[Session]) -> bytes:
+        """
+        Build iCal data from sessions by writing the content lines directly.
+
+        Args:
+            sessions: List of Session objects
+
+        Returns:
+            Serialized calendar
+        """
+        description = CALENDAR_DESC if sessions else PLACEHOLDER_DESC
+        parts = [
+            _CALENDAR_HEAD,
+            _fold(f'X-WR-CALDESC:{description.translate(_ICAL_ESCAPE)}') + '\r\n',
+            self._calendar_name_line,
+            self._timezone_line,
+        ]
+
+        dtstamp = time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())
+        alarms = self._alarms_block
+
+        # Add events for each session
+        for session in sessions:
+            event_description = (
+                f"Free electricity session: {session.session_str}\n"
+                f"Duration: {session.duration}\n"
+                f"Make sure to use electricity during this period!"
+            )
+            parts.append(_EVENT_TEMPLATE.format(
+                start=session.start_time.strftime('%Y%m%dT%H%M%S'),
+                end=session.end_time.strftime('%Y%m%dT%H%M%S'),
+                dtstamp=dtstamp,
+                # Generate unique UID based on session start time
+                uid=f"{session.start_time.strftime('%Y%m%d%H%M')}@octopus.energy",
+                description=_fold(f'DESCRIPTION:{event_description.translate(_ICAL_ESCAPE)}'),
+                alarms=alarms,
+            ))
             logger.debug(f"Added event for session: {session.session_str}")
 
+        parts.append(_CALENDAR_FOOT)
+        return ''.join(parts).encode('utf-8')
+
+    def generate(self, sessions: List[Session], output_path: Path) -> bool:
+        """
+        Generate iCal file from sessions.
+
+        Args:
+            sessions: List of Session objects
+            output_path: Path to save iCal file
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not sessions:
+            logger.info("Generating placeholder iCal file with no sessions")
+
+        if self._builder:
+            data = self._builder.build(sessions)
+        else:
+            data = self._build(sessions)
+
+        # Skip the write if the file already has the same content, which saves
+        # disk I/O and preserves its mtime for calendar sync clients
+        try:
+            with open(output_path, 'rb') as f:
+                unchanged = _content_hash(f.read()) == _content_hash(data)
+        except OSError:
+            unchanged = False
+        if unchanged:
+            logger.info(f"iCal file unchanged, skipping write: {output_path}")
+            return True
+
         # Write to file
         try:
             output_path.parent.mkdir(parents=True, exist_ok=True)
             with open(output_path, 'wb') as f:
-                f.write(cal.to_ical())
+                f.write(data)
             logger.info(f"Generated iCal file: {output_path} ({len(sessions)} event(s))")
             return True
         except Exception as e:
@@ -145,4 +380,3 @@ class ICalGenerator:
             True if successful, False otherwise
         """
         return self.generate(sessions, output_path)
-    
\ No newline at end of file
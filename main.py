@@ -4,11 +4,9 @@ import argparse
 import logging
 import os
 import time
-import json
-import yaml
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Set
+from typing import AbstractSet, Any, Dict, List, Optional, Set, Tuple
 from octopus_scraper import OctopusScraper
 from session_parser import SessionParser, Session
 from ical_generator import ICalGenerator
@@ -31,6 +29,8 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
             f"Please copy config.yaml.example to config.yaml and configure it."
         )
 
+    import yaml  # Only needed here; deferred to keep startup fast
+
     with open(config_path, 'r') as f:
         config = yaml.safe_load(f) or {}
 
@@ -73,86 +73,222 @@ def get_config_value(config: Dict[str, Any], key: str, default: Any = None) -> A
 
 
 class SessionTracker:
-    """Tracks sessions and notifications that have been sent."""
+    """
+    Tracks sessions and notifications that have been sent.
+
+    Each session string maps to a bitmask of SEEN/UPCOMING/START/END flags
+    and a timestamp (the session's end time, if known) used to expire old
+    entries. State is persisted as an append-only log with one
+    '<flags>:<timestamp>:<session_str>' entry per line, which is
+    periodically compacted to one line per session.
+    """
+
+    __slots__ = ('state_file', 'flags', '_pending', '_log_lines')
+
+    SEEN = 1
+    # Same bits as Notifier.due_notifications() so they can be masked together
+    UPCOMING = Notifier.UPCOMING
+    START = Notifier.START
+    END = Notifier.END
+
+    # Value returned by flags.get() for untracked sessions
+    EMPTY = (0, 0.0)
+
+    # Rewrite the log once it holds this many redundant lines
+    COMPACT_THRESHOLD = 1000
 
     def __init__(self, state_file: Path):
         """
         Initialize session tracker.
 
         Args:
-            state_file: Path to state file for persistence
+            state_file: Path to state log file for persistence
         """
         self.state_file = state_file
-        self.seen_sessions: Set[str] = set()
-        self.notified_upcoming: Set[str] = set()
-        self.notified_start: Set[str] = set()
-        self.notified_end: Set[str] = set()
+        self.flags: Dict[str, Tuple[int, float]] = {}
+        self._pending: List[str] = []
+        self._log_lines = 0
         self._load_state()
 
     def _load_state(self) -> None:
-        """Load state from file."""
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    self.seen_sessions = set(data.get('seen_sessions', []))
-                    self.notified_upcoming = set(data.get('notified_upcoming', []))
-                    self.notified_start = set(data.get('notified_start', []))
-                    self.notified_end = set(data.get('notified_end', []))
-                logging.debug(f"Loaded state: {len(self.seen_sessions)} sessions")
-            except Exception as e:
-                logging.error(f"Failed to load state: {e}")
-
-    def _save_state(self) -> None:
-        """Save state to file."""
+        """Load state by replaying the log file."""
+        if not self.state_file.exists():
+            self._migrate_json_state()
+            return
+
+        try:
+            entries = self.flags
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self._log_lines += 1
+                    if not line.endswith('\n'):
+                        # Final line torn by an interrupted append
+                        logging.warning(f"Ignoring incomplete state entry: {line}")
+                        continue
+                    tag, _, rest = line.rstrip('\r\n').partition(':')
+                    ts, _, session_str = rest.partition(':')
+                    if not session_str:
+                        # Also catches a torn entry terminated by a later append
+                        logging.warning(f"Ignoring invalid state entry: {line.rstrip()}")
+                        continue
+                    try:
+                        flags = entries.get(session_str, self.EMPTY)[0] | int(tag)
+                        entries[session_str] = (flags, float(ts))
+                    except ValueError:
+                        logging.warning(f"Ignoring invalid state entry: {line.rstrip()}")
+            logging.debug(f"Loaded state: {len(self.flags)} sessions")
+        except Exception as e:
+            logging.error(f"Failed to load state: {e}")
+
+    def _migrate_json_state(self) -> None:
+        """Import state from the legacy state.json file, if present."""
+        json_file = self.state_file.with_suffix('.json')
+        if not json_file.exists():
+            return
+
+        import json  # Only needed for this one-off migration
+
+        try:
+            with open(json_file, 'r') as f:
+                data = json.load(f)
+            # Stamp entries with the session's end time so they aren't pruned
+            # before the session happens; unparseable ones get a year's grace
+            parser = SessionParser()
+            now = datetime.now()
+            fallback_ts = (now + timedelta(days=366)).timestamp()
+            for key, flag in (
+                ('seen_sessions', self.SEEN),
+                ('notified_upcoming', self.UPCOMING),
+                ('notified_start', self.START),
+                ('notified_end', self.END),
+            ):
+                for session_str in data.get(key, []):
+                    flags, ts = self.flags.get(session_str, self.EMPTY)
+                    if not flags:
+                        session = parser.parse(session_str, now)
+                        ts = session.end_time.timestamp() if session else fallback_ts
+                    self.flags[session_str] = (flags | flag, ts)
+            logging.info(f"Migrated state from {json_file}: {len(self.flags)} sessions")
+            self._compact()
+        except Exception as e:
+            logging.error(f"Failed to migrate state: {e}")
+
+    def _set_flag(self, session_str: str, flag: int, end_ts: Optional[float] = None) -> None:
+        """
+        Set a flag for a session and queue it to be appended to the log.
+
+        Args:
+            session_str: Session string
+            flag: Flag to set
+            end_ts: Session end time as a Unix timestamp (defaults to the
+                existing timestamp, or the current time for new entries)
+        """
+        flags, ts = self.flags.get(session_str, self.EMPTY)
+        if flags & flag:
+            return
+        if end_ts is not None:
+            ts = end_ts
+        elif not flags:
+            ts = time.time()
+        self.flags[session_str] = (flags | flag, ts)
+        self._pending.append(f"{flag}:{ts:.0f}:{session_str}\n")
+
+    def _compact(self) -> None:
+        """Rewrite the log from the current flags (atomically, via a temporary file)."""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            lines = [
+                f"{flags}:{ts:.0f}:{session_str}\n"
+                for session_str, (flags, ts) in self.flags.items()
+            ]
+            tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            os.replace(tmp_file, self.state_file)
+            self._pending.clear()
+            self._log_lines = len(lines)
+            logging.debug("Compacted state log")
+        except Exception as e:
+            logging.error(f"Failed to compact state: {e}")
+
+    def flush(self) -> None:
+        """Append pending entries to the log, compacting it if it has grown too large."""
+        if not self._pending:
+            return
+
+        if self._log_lines + len(self._pending) - len(self.flags) > self.COMPACT_THRESHOLD:
+            self._compact()
+            return
+
         try:
             self.state_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.state_file, 'w') as f:
-                json.dump({
-                    'seen_sessions': list(self.seen_sessions),
-                    'notified_upcoming': list(self.notified_upcoming),
-                    'notified_start': list(self.notified_start),
-                    'notified_end': list(self.notified_end),
-                }, f, indent=2)
+            with open(self.state_file, 'ab+') as f:
+                # Terminate a line torn by an interrupted append so the new
+                # entries don't get joined onto it
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write(''.join(self._pending).encode('utf-8'))
+            self._log_lines += len(self._pending)
+            self._pending.clear()
             logging.debug("Saved state")
         except Exception as e:
             logging.error(f"Failed to save state: {e}")
 
+    def prune(self, cutoff_ts: float, keep: AbstractSet[str] = frozenset()) -> None:
+        """
+        Forget sessions whose timestamp is older than the cutoff.
+
+        Args:
+            cutoff_ts: Unix timestamp; entries older than this are removed
+            keep: Session strings that are still in use and must not be removed
+        """
+        expired = [
+            s for s, (_, ts) in self.flags.items()
+            if ts < cutoff_ts and s not in keep
+        ]
+        if not expired:
+            return
+
+        for session_str in expired:
+            del self.flags[session_str]
+        logging.info(f"Pruned {len(expired)} expired session(s) from state")
+
+        # Rewrite the log so expired entries aren't replayed on the next load
+        self._compact()
+
     def is_new_session(self, session_str: str) -> bool:
         """Check if session is new."""
-        return session_str not in self.seen_sessions
+        return not self.flags.get(session_str, self.EMPTY)[0] & self.SEEN
 
-    def mark_seen(self, session_str: str) -> None:
-        """Mark session as seen."""
-        self.seen_sessions.add(session_str)
-        self._save_state()
+    def mark_seen(self, session_str: str, end_ts: Optional[float] = None) -> None:
+        """Mark session as seen, optionally recording its end time."""
+        self._set_flag(session_str, self.SEEN, end_ts)
 
     def should_notify_upcoming(self, session_str: str) -> bool:
         """Check if upcoming notification should be sent."""
-        return session_str not in self.notified_upcoming
+        return not self.flags.get(session_str, self.EMPTY)[0] & self.UPCOMING
 
     def mark_notified_upcoming(self, session_str: str) -> None:
         """Mark upcoming notification as sent."""
-        self.notified_upcoming.add(session_str)
-        self._save_state()
+        self._set_flag(session_str, self.UPCOMING)
 
     def should_notify_start(self, session_str: str) -> bool:
         """Check if start notification should be sent."""
-        return session_str not in self.notified_start
+        return not self.flags.get(session_str, self.EMPTY)[0] & self.START
 
     def mark_notified_start(self, session_str: str) -> None:
         """Mark start notification as sent."""
-        self.notified_start.add(session_str)
-        self._save_state()
+        self._set_flag(session_str, self.START)
 
     def should_notify_end(self, session_str: str) -> bool:
         """Check if end notification should be sent."""
-        return session_str not in self.notified_end
+        return not self.flags.get(session_str, self.EMPTY)[0] & self.END
 
     def mark_notified_end(self, session_str: str) -> None:
         """Mark end notification as sent."""
-        self.notified_end.add(session_str)
-        self._save_state()
+        self._set_flag(session_str, self.END)
 
 
 class OctopusEnergyMonitor:
@@ -180,10 +316,11 @@ class OctopusEnergyMonitor:
         # iCal alarm configuration
         alarms_enabled = get_config_value(self.config, 'ical.alarms.enabled', True)
         alarm_times = get_config_value(self.config, 'ical.alarms.times', [60, 15, 0])
+        use_icalendar = get_config_value(self.config, 'ical.use_icalendar', False)
 
         self.scraper = OctopusScraper(scraper_url)
         self.parser = SessionParser(timezone)
-        self.ical_generator = ICalGenerator(timezone, alarms_enabled, alarm_times)
+        self.ical_generator = ICalGenerator(timezone, alarms_enabled, alarm_times, use_icalendar)
         self.notifier = Notifier(
             apprise_urls=apprise_urls,
             enabled=get_config_value(self.config, 'notifications.enabled', False),
@@ -192,14 +329,35 @@ class OctopusEnergyMonitor:
             notify_end=get_config_value(self.config, 'notifications.notify_end', True)
         )
 
-        # Initialize session tracker
+        # Settings used on every cycle (resolved once, they don't change at runtime)
         output_dir = Path(get_config_value(self.config, 'ical.output_dir', './output'))
-        state_file = output_dir / 'state.json'
+        filename = get_config_value(self.config, 'ical.filename', 'octopus_free_electricity.ics')
+        self._ical_output_path = output_dir / filename
+        self._cleanup_enabled = get_config_value(self.config, 'ical.cleanup.enabled', True)
+        self._days_to_keep = get_config_value(self.config, 'ical.cleanup.days_to_keep', 7)
+        self._upcoming_hours = get_config_value(self.config, 'notifications.upcoming_hours', 1)
+        self._scrape_interval = get_config_value(self.config, 'scraper.check_interval_minutes', 60)
+        self._notification_interval = get_config_value(self.config, 'notifications.check_interval_minutes', 5)
+
+        # Initialize session tracker
+        state_file = output_dir / 'state.log'
         self.tracker = SessionTracker(state_file)
 
         # Store parsed sessions
         self.sessions: List[Session] = []
 
+        # Cache parsed sessions by session string. A cached session keeps the
+        # year chosen when it was first parsed; entries are dropped once the
+        # session has ended (see cleanup_old_sessions)
+        self._session_cache: Dict[str, Session] = {}
+        self._session_strs: Set[str] = set()
+        # Session strings from the most recent scrape
+        self._scraped_strs: Set[str] = set()
+
+        # Signature of the last written iCal file, used to skip unchanged rewrites
+        self._last_ical_sig: Optional[int] = None
+        self._last_ical_stat: Optional[Tuple[int, int]] = None
+
     def _setup_logging(self) -> None:
         """Setup logging configuration."""
         log_level_str = get_config_value(self.config, 'logging.level', 'INFO').upper()
@@ -223,6 +381,24 @@ class OctopusEnergyMonitor:
         logging.info("Octopus Energy Free Electricity Monitor Started")
         logging.info("=" * 60)
 
+    def _get_session(self, session_str: str, now: Optional[datetime] = None) -> Optional[Session]:
+        """
+        Parse a session string, reusing a previously parsed result if available.
+
+        Args:
+            session_str: Session string to parse
+            now: Current time passed through to the parser
+
+        Returns:
+            Session object or None if parsing fails
+        """
+        session = self._session_cache.get(session_str)
+        if session is None:
+            session = self.parser.parse(session_str, now)
+            if session:
+                self._session_cache[session_str] = session
+        return session
+
     def scrape_sessions(self) -> bool:
         """
         Scrape and parse sessions from website.
@@ -232,6 +408,7 @@ class OctopusEnergyMonitor:
         """
         logging.info("Scraping Octopus Energy website...")
         session_type, session_strings = self.scraper.scrape()
+        self._scraped_strs = set(session_strings)
 
         if not session_strings:
             logging.info("No sessions found")
@@ -239,15 +416,30 @@ class OctopusEnergyMonitor:
 
         logging.info(f"Found {len(session_strings)} session(s) (type: {session_type})")
 
-        # Parse sessions
+        # Partition the scraped sessions with set operations. Every session in
+        # the tracker has been marked seen (notifications are only recorded for
+        # scraped sessions), so its keys stand in for the set of seen sessions.
+        incoming = self._scraped_strs
+        known_strs = incoming & self.tracker.flags.keys()
+        new_strs = incoming - known_strs
+        # Known sessions that aren't in the session list (e.g. after a restart)
+        missing_strs = known_strs - self._session_strs
+
+        if not new_strs and not missing_strs:
+            return False
+
+        # Parse sessions (in scraped order) against a single clock read
+        now = datetime.now()
         new_sessions_found = False
         for session_str in session_strings:
-            # Check if we've seen this session before
-            if self.tracker.is_new_session(session_str):
-                session = self.parser.parse(session_str)
+            if session_str in new_strs:
+                new_strs.discard(session_str)
+                session = self._get_session(session_str, now)
                 if session:
-                    self.sessions.append(session)
-                    self.tracker.mark_seen(session_str)
+                    if session_str not in self._session_strs:
+                        self.sessions.append(session)
+                        self._session_strs.add(session_str)
+                    self.tracker.mark_seen(session_str, session.end_time.timestamp())
                     new_sessions_found = True
                     logging.info(f"New session: {session_str}")
 
@@ -256,43 +448,58 @@ class OctopusEnergyMonitor:
                         self.notifier.notify_new_session(session)
                 else:
                     logging.warning(f"Failed to parse session: {session_str}")
-            else:
-                # Session already known, add to list if not already there
-                session = self.parser.parse(session_str)
-                if session and not any(s.session_str == session_str for s in self.sessions):
+            elif session_str in missing_strs:
+                # Session already known, add it to the list
+                missing_strs.discard(session_str)
+                session = self._get_session(session_str, now)
+                if session:
                     self.sessions.append(session)
+                    self._session_strs.add(session_str)
 
         return new_sessions_found
 
+    @staticmethod
+    def _stat_ical_file(path: Path) -> Optional[Tuple[int, int]]:
+        """Get (mtime, size) of an iCal file, or None if it does not exist."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
     def update_ical(self) -> None:
         """Update iCal file with current sessions."""
 
-        # Get cleanup settings
-        cleanup_enabled = get_config_value(self.config, 'ical.cleanup.enabled', True)
-        days_to_keep = get_config_value(self.config, 'ical.cleanup.days_to_keep', 7)
-
         now = datetime.now()
 
-        # Filter sessions based on cleanup settings
-        if cleanup_enabled:
-            # Remove sessions older than days_to_keep
-            cutoff_date = now - timedelta(days=days_to_keep)
-            filtered_sessions = [s for s in self.sessions if s.end_time > cutoff_date]
-            removed_count = len(self.sessions) - len(filtered_sessions)
-            if removed_count > 0:
-                logging.info(f"Removed {removed_count} session(s) older than {days_to_keep} days")
-        else:
-            # Keep all sessions (including past ones)
-            filtered_sessions = self.sessions
+        # Remove sessions older than days_to_keep (if cleanup is enabled) and
+        # count upcoming vs recent past sessions for logging, in a single pass
+        cutoff_date = now - timedelta(days=self._days_to_keep) if self._cleanup_enabled else None
+        filtered_sessions: List[Session] = []
+        upcoming_count = 0
+        past_count = 0
+        for s in self.sessions:
+            end_time = s.end_time
+            if cutoff_date is not None and end_time <= cutoff_date:
+                continue
+            filtered_sessions.append(s)
+            if end_time > now:
+                upcoming_count += 1
+            else:
+                past_count += 1
 
-        # Separate upcoming and recent past sessions for logging
-        upcoming_sessions = [s for s in filtered_sessions if s.end_time > now]
-        past_sessions = [s for s in filtered_sessions if s.end_time <= now]
+        removed_count = len(self.sessions) - len(filtered_sessions)
+        if removed_count > 0:
+            logging.info(f"Removed {removed_count} session(s) older than {self._days_to_keep} days")
 
-        # Get iCal output path
-        output_dir = Path(get_config_value(self.config, 'ical.output_dir', './output'))
-        filename = get_config_value(self.config, 'ical.filename', 'octopus_free_electricity.ics')
-        ical_output_path = output_dir / filename
+        ical_output_path = self._ical_output_path
+
+        # Skip regeneration if the sessions and the file on disk are unchanged
+        sig = hash(tuple(sorted(s.session_str for s in filtered_sessions)))
+        if (sig == self._last_ical_sig and
+                self._stat_ical_file(ical_output_path) == self._last_ical_stat):
+            logging.debug("Sessions unchanged, skipping iCal regeneration")
+            return
 
         if not filtered_sessions:
             logging.info("No sessions to write to iCal - generating placeholder file")
@@ -301,20 +508,25 @@ class OctopusEnergyMonitor:
                 logging.info(f"iCal placeholder updated: {ical_output_path}")
             else:
                 logging.error("Failed to generate placeholder iCal file")
-            return
-        
-        logging.info(
-            "Updating iCal file with %s session(s) (%s upcoming, %s recent past)...",
-            len(filtered_sessions),
-            len(upcoming_sessions),
-            len(past_sessions)
-        )
-        
-        success = self.ical_generator.generate(filtered_sessions, ical_output_path)
+        else:
+            logging.info(
+                "Updating iCal file with %s session(s) (%s upcoming, %s recent past)...",
+                len(filtered_sessions),
+                upcoming_count,
+                past_count
+            )
+
+            success = self.ical_generator.generate(filtered_sessions, ical_output_path)
+            if success:
+                logging.info(f"iCal file updated: {ical_output_path}")
+            else:
+                logging.error("Failed to update iCal file")
+
         if success:
-            logging.info(f"iCal file updated: {ical_output_path}")
+            self._last_ical_sig = sig
+            self._last_ical_stat = self._stat_ical_file(ical_output_path)
         else:
-            logging.error("Failed to update iCal file")
+            self._last_ical_sig = None
 
     def check_notifications(self) -> None:
         """Check if any notifications should be sent."""
@@ -322,40 +534,58 @@ class OctopusEnergyMonitor:
             return
 
         now = datetime.now()
-        upcoming_hours = get_config_value(self.config, 'notifications.upcoming_hours', 1)
+        upcoming_hours = self._upcoming_hours
 
         for session in self.sessions:
             # Skip past sessions
             if session.end_time < now:
                 continue
 
+            due = self.notifier.due_notifications(session, now)
+            if not due:
+                continue
+
+            # Drop notifications that have already been sent
+            due &= ~self.tracker.flags.get(session.session_str, SessionTracker.EMPTY)[0]
+
             # Check upcoming notification
-            if (self.tracker.should_notify_upcoming(session.session_str) and
-                self.notifier.should_notify_upcoming(session)):
+            if due & Notifier.UPCOMING:
                 self.notifier.notify_upcoming_session(session, upcoming_hours)
                 self.tracker.mark_notified_upcoming(session.session_str)
 
             # Check start notification
-            if (self.tracker.should_notify_start(session.session_str) and
-                self.notifier.should_notify_start(session)):
+            if due & Notifier.START:
                 self.notifier.notify_session_starting(session)
                 self.tracker.mark_notified_start(session.session_str)
 
             # Check end notification
-            if (self.tracker.should_notify_end(session.session_str) and
-                self.notifier.should_notify_end(session)):
+            if due & Notifier.END:
                 self.notifier.notify_session_ending(session)
                 self.tracker.mark_notified_end(session.session_str)
 
     def cleanup_old_sessions(self) -> None:
-        """Remove sessions that have already ended."""
+        """Remove sessions that have already ended and expire old tracker state."""
         now = datetime.now()
+
         before_count = len(self.sessions)
         self.sessions = [s for s in self.sessions if s.end_time > now]
+        self._session_strs = {s.session_str for s in self.sessions}
+        self._session_cache = {
+            session_str: session
+            for session_str, session in self._session_cache.items()
+            if session.end_time > now
+        }
         removed = before_count - len(self.sessions)
         if removed > 0:
             logging.info(f"Removed {removed} past session(s)")
 
+        # Forget sessions that have also dropped out of the iCal file, unless
+        # they are still listed or still shown on the page (e.g. as the last
+        # session), which would otherwise be picked up as new again
+        if self._cleanup_enabled:
+            cutoff_date = now - timedelta(days=self._days_to_keep)
+            self.tracker.prune(cutoff_date.timestamp(), self._session_strs | self._scraped_strs)
+
     def run_scrape_cycle(self) -> None:
         """Run scraping cycle (checks website for new sessions)."""
         try:
@@ -371,6 +601,8 @@ class OctopusEnergyMonitor:
 
         except Exception as e:
             logging.error(f"Error in scrape cycle: {e}", exc_info=True)
+        finally:
+            self.tracker.flush()
 
     def run_notification_cycle(self) -> None:
         """Run notification cycle (checks if notifications should be sent)."""
@@ -383,39 +615,82 @@ class OctopusEnergyMonitor:
 
         except Exception as e:
             logging.error(f"Error in notification cycle: {e}", exc_info=True)
+        finally:
+            self.tracker.flush()
+
+    def close(self) -> None:
+        """Flush state, wait for pending notifications and release connections."""
+        self.tracker.flush()
+        self.notifier.close()
+        self.scraper.close()
 
     def run(self) -> None:
         """Run the monitor continuously with separate scrape and notification intervals."""
-        scrape_interval = get_config_value(self.config, 'scraper.check_interval_minutes', 60)
-        notification_interval = get_config_value(self.config, 'notifications.check_interval_minutes', 5)
+        scrape_interval = self._scrape_interval
+        notification_interval = self._notification_interval
 
         logging.info("=" * 60)
         logging.info(f"Scrape interval: {scrape_interval} minutes")
         logging.info(f"Notification check interval: {notification_interval} minutes")
         logging.info("=" * 60)
+        if scrape_interval <= 0 or notification_interval <= 0:
+            logging.warning("Check intervals should be greater than 0; cycles will run back to back")
 
-        # Track time since last scrape
-        minutes_since_scrape = scrape_interval  # Run scrape immediately on first iteration
+        scrape_seconds = scrape_interval * 60
+        notification_seconds = notification_interval * 60
 
         # Run initial scrape
         self.run_scrape_cycle()
 
+        # Schedule against fixed monotonic deadlines so cycle run time doesn't
+        # accumulate as drift and wall-clock changes don't affect the cadence
+        start = time.monotonic()
+        next_scrape = start + scrape_seconds
+        next_notification = start + notification_seconds
+
         while True:
-            # Sleep for notification check interval
-            sleep_seconds = notification_interval * 60
-            logging.debug(f"Sleeping for {notification_interval} minutes...")
+            sleep_seconds = max(0.0, min(next_scrape, next_notification) - time.monotonic())
+            logging.debug(f"Sleeping for {sleep_seconds / 60:.1f} minutes...")
             time.sleep(sleep_seconds)
 
-            minutes_since_scrape += notification_interval
+            now = time.monotonic()
 
             # Check if it's time to scrape
-            if minutes_since_scrape >= scrape_interval:
+            if now >= next_scrape:
                 self.run_scrape_cycle()
-                minutes_since_scrape = 0
-            else:
-                # Only run notification checks
-                logging.debug(f"Running notification cycle ({minutes_since_scrape}/{scrape_interval} min until next scrape)...")
+                next_scrape = self._next_deadline(next_scrape, scrape_seconds, time.monotonic())
+
+            # Check if it's time to run notification checks
+            if now >= next_notification:
+                logging.debug(
+                    f"Running notification cycle "
+                    f"({max(0.0, next_scrape - time.monotonic()) / 60:.0f} min until next scrape)..."
+                )
                 self.run_notification_cycle()
+                next_notification = self._next_deadline(
+                    next_notification, notification_seconds, time.monotonic()
+                )
+
+    @staticmethod
+    def _next_deadline(deadline: float, interval: float, now: float) -> float:
+        """
+        Advance a deadline by one interval, skipping slots missed while overrunning.
+
+        Args:
+            deadline: Deadline that has just been reached (monotonic seconds)
+            interval: Interval between deadlines in seconds
+            now: Current monotonic time
+
+        Returns:
+            Next deadline strictly after now, or now if the interval is not
+            positive (the cycle then runs on every pass, as it did before)
+        """
+        if interval <= 0:
+            return now
+        deadline += interval
+        if deadline <= now:
+            deadline += ((now - deadline) // interval + 1) * interval
+        return deadline
 
 
 def main():
@@ -446,6 +721,7 @@ def main():
         else:
             config_path = 'config.yaml'
 
+    monitor = None
     try:
         monitor = OctopusEnergyMonitor(config_path)
 
@@ -463,6 +739,9 @@ def main():
     except Exception as e:
         logging.error(f"Fatal error: {e}", exc_info=True)
         raise
+    finally:
+        if monitor is not None:
+            monitor.close()
 
 
 if __name__ == "__main__":
@@ -1,17 +1,32 @@
 """Notification system using Apprise."""
 
 import logging
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from session_parser import Session
 
+if TYPE_CHECKING:
+    import apprise
+
 
 logger = logging.getLogger(__name__)
 
+# Tolerance either side of a notification time
+NOTIFICATION_WINDOW = timedelta(minutes=5)
+
+# Apprise instances keyed by their (sorted) URLs, so each URL set is parsed once
+_APPRISE_CACHE: Dict[Tuple[str, ...], "apprise.Apprise"] = {}
+
 
 class Notifier:
     """Notification handler using Apprise."""
 
+    # Bits returned by due_notifications()
+    UPCOMING = 2
+    START = 4
+    END = 8
+
     def __init__(
         self,
         apprise_urls: List[str],
@@ -36,21 +51,32 @@ class Notifier:
         self.notify_start = notify_start
         self.notify_end = notify_end
         self.apprise = None
+        self._executor: Optional[ThreadPoolExecutor] = None
 
         if self.enabled and self.apprise_urls:
             self._initialize_apprise()
+            # Send in the background so a slow service can't stall the cycle;
+            # a single worker keeps notifications in the order they were queued
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notifier')
 
     def _initialize_apprise(self) -> None:
         """Initialize Apprise instance."""
+        key = tuple(sorted(url for url in self.apprise_urls if url))
+        cached = _APPRISE_CACHE.get(key)
+        if cached is not None:
+            self.apprise = cached
+            logger.debug(f"Reusing Apprise instance with {len(key)} service(s)")
+            return
+
         try:
             import apprise
             self.apprise = apprise.Apprise()
 
             # Add all URLs
-            for url in self.apprise_urls:
-                if url:
-                    self.apprise.add(url)
+            for url in key:
+                self.apprise.add(url)
 
+            _APPRISE_CACHE[key] = self.apprise
             logger.info(f"Initialized Apprise with {len(self.apprise_urls)} service(s)")
         except ImportError:
             logger.error(
@@ -63,34 +89,46 @@ class Notifier:
 
     def send_notification(self, title: str, body: str) -> bool:
         """
-        Send a notification.
+        Send a notification (dispatched on a background thread).
 
         Args:
             title: Notification title
             body: Notification body
 
         Returns:
-            True if sent successfully, False otherwise
+            True if queued successfully, False otherwise
         """
         if not self.enabled:
             logger.debug("Notifications disabled, skipping")
             return False
 
-        if not self.apprise:
+        if not self.apprise or not self._executor:
             logger.warning("Apprise not initialized, cannot send notification")
             return False
 
         try:
-            self.apprise.notify(
-                title=title,
-                body=body
-            )
-            logger.info(f"Sent notification: {title}")
+            self._executor.submit(self._send, title, body)
             return True
         except Exception as e:
-            logger.error(f"Failed to send notification: {e}")
+            logger.error(f"Failed to queue notification: {e}")
             return False
 
+    def _send(self, title: str, body: str) -> None:
+        """Send a notification via Apprise (runs on the executor)."""
+        try:
+            if self.apprise.notify(title=title, body=body):
+                logger.info(f"Sent notification: {title}")
+            else:
+                logger.error(f"Failed to send notification: {title}")
+        except Exception as e:
+            logger.error(f"Failed to send notification: {e}")
+
+    def close(self) -> None:
+        """Wait for queued notifications to be sent and stop the executor."""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
     def notify_new_session(self, session: Session) -> bool:
         """
         Notify about a new session being scheduled.
@@ -99,13 +137,13 @@ class Notifier:
             session: Session object
 
         Returns:
-            True if sent successfully
+            True if queued successfully
         """
         title = "⚡ New Free Electricity Session Scheduled"
         body = (
             f"Session: {session.session_str}\n"
-            f"Start: {session.start_time.strftime('%A, %d %B %Y at %I:%M %p')}\n"
-            f"End: {session.end_time.strftime('%I:%M %p')}\n"
+            f"Start: {session.start_long}\n"
+            f"End: {session.end_short}\n"
             f"Duration: {session.duration}"
         )
         return self.send_notification(title, body)
@@ -119,13 +157,13 @@ class Notifier:
             hours: Hours until session starts
 
         Returns:
-            True if sent successfully
+            True if queued successfully
         """
         title = f"⏰ Free Electricity in {hours} hour{'s' if hours != 1 else ''}"
         body = (
             f"Session: {session.session_str}\n"
-            f"Starts: {session.start_time.strftime('%A, %d %B %Y at %I:%M %p')}\n"
-            f"Ends: {session.end_time.strftime('%I:%M %p')}\n"
+            f"Starts: {session.start_long}\n"
+            f"Ends: {session.end_short}\n"
             f"Get ready to use electricity!"
         )
         return self.send_notification(title, body)
@@ -138,12 +176,12 @@ class Notifier:
             session: Session object
 
         Returns:
-            True if sent successfully
+            True if queued successfully
         """
         title = "🎉 Free Electricity Starting NOW!"
         body = (
             f"Session: {session.session_str}\n"
-            f"Ends: {session.end_time.strftime('%I:%M %p')}\n"
+            f"Ends: {session.end_short}\n"
             f"Duration: {session.duration}\n"
             f"Start using electricity now!"
         )
@@ -157,7 +195,7 @@ class Notifier:
             session: Session object
 
         Returns:
-            True if sent successfully
+            True if queued successfully
         """
         title = "⏱️ Free Electricity Ending NOW"
         body = (
@@ -167,58 +205,69 @@ class Notifier:
         )
         return self.send_notification(title, body)
 
-    def should_notify_upcoming(self, session: Session) -> bool:
+    def due_notifications(self, session: Session, now: datetime) -> int:
         """
-        Check if we should send upcoming notification for this session.
+        Check which notifications are due for this session.
 
         Args:
             session: Session object
+            now: Current time
 
         Returns:
-            True if notification should be sent
+            Bitmask of UPCOMING, START and END for notifications whose time is
+            within 5 minutes of now (0 if none are due)
         """
         if not self.enabled:
-            return False
+            return 0
+
+        earliest = now - NOTIFICATION_WINDOW
+        latest = now + NOTIFICATION_WINDOW
+        start_time = session.start_time
+
+        due = 0
+        if earliest < start_time - timedelta(hours=self.upcoming_hours) < latest:
+            due |= self.UPCOMING
+        if self.notify_start and earliest < start_time < latest:
+            due |= self.START
+        if self.notify_end and earliest < session.end_time < latest:
+            due |= self.END
+        return due
+
+    def should_notify_upcoming(self, session: Session, now: Optional[datetime] = None) -> bool:
+        """
+        Check if we should send upcoming notification for this session.
 
-        now = datetime.now()
-        notification_time = session.start_time - timedelta(hours=self.upcoming_hours)
+        Args:
+            session: Session object
+            now: Current time (defaults to datetime.now())
 
-        # Check if we're within the notification window (5 minute tolerance)
-        time_diff = abs((now - notification_time).total_seconds())
-        return time_diff < 300  # 5 minutes in seconds
+        Returns:
+            True if notification should be sent
+        """
+        return bool(self.due_notifications(session, now or datetime.now()) & self.UPCOMING)
 
-    def should_notify_start(self, session: Session) -> bool:
+    def should_notify_start(self, session: Session, now: Optional[datetime] = None) -> bool:
         """
         Check if we should send start notification for this session.
 
         Args:
             session: Session object
+            now: Current time (defaults to datetime.now())
 
         Returns:
             True if notification should be sent
         """
-        if not self.enabled or not self.notify_start:
-            return False
+        return bool(self.due_notifications(session, now or datetime.now()) & self.START)
 
-        now = datetime.now()
-        # Check if we're within 5 minutes of start time
-        time_diff = abs((now - session.start_time).total_seconds())
-        return time_diff < 300  # 5 minutes in seconds
-
-    def should_notify_end(self, session: Session) -> bool:
+    def should_notify_end(self, session: Session, now: Optional[datetime] = None) -> bool:
         """
         Check if we should send end notification for this session.
 
         Args:
             session: Session object
+            now: Current time (defaults to datetime.now())
 
         Returns:
             True if notification should be sent
         """
-        if not self.enabled or not self.notify_end:
-            return False
-
-        now = datetime.now()
-        # Check if we're within 5 minutes of end time
-        time_diff = abs((now - session.end_time).total_seconds())
-        return time_diff < 300  # 5 minutes in seconds
+        return bool(self.due_notifications(session, now or datetime.now()) & self.END)
@@ -2,12 +2,37 @@
 
 import re
 import logging
-from typing import List, Optional, Tuple
-import requests
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
+if TYPE_CHECKING:
+    import requests
+
+
+__all__ = ['OctopusScraper']
 
 logger = logging.getLogger(__name__)
 
+_NEXT_SESSIONS_RE = re.compile(r'Next\s+Sessions?:', re.IGNORECASE)
+_ANCHOR_RE = re.compile(r'(?P<next>Next\s+Sessions?:)|(?P<last>Last\s+Session:)', re.IGNORECASE)
+_LEGACY_NEXT_RE = re.compile(r'Next(?:\s+\w+)*\s+Sessions?:\s*([^<\n]+)', re.IGNORECASE)
+_HEADING_RE = re.compile(r'<h\d[^>]*>', re.IGNORECASE)
+_LAST_END_RE = re.compile(r'<h\d[^>]*>|Next Power Tower', re.IGNORECASE)
+# Characters of already-downloaded content re-scanned when a new chunk arrives
+_SCAN_OVERLAP = 256
+_TAG_RE = re.compile(r'<[^>]+>')
+# The month is spelled out so a following word run into it (e.g.
+# 'OctoberNext') is not swallowed
+_SESSION_RE = re.compile(
+    r'\d+(?:am|pm)?-\d+(?:am|pm)?,\s*\w+\s*\d+(?:st|nd|rd|th)?\s*'
+    r'(?:January|February|March|April|May|June|July|August|September|October|November|December)',
+    re.IGNORECASE
+)
+
+
+def _find_sessions(text: str) -> List[str]:
+    """Find session strings in text, collapsing whitespace (a session may wrap lines)."""
+    return [' '.join(found.split()) for found in _SESSION_RE.findall(text)]
+
 
 class OctopusScraper:
     """Scraper for Octopus Energy free electricity page."""
@@ -20,6 +45,38 @@ class OctopusScraper:
             url: URL of the Octopus Energy free electricity page
         """
         self.url = url
+        self._session: Optional['requests.Session'] = None
+
+    def _get_session(self) -> 'requests.Session':
+        """Get the HTTP session, creating it on first use."""
+        if self._session is None:
+            # Deferred so parsing-only use of this module doesn't pay for requests
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # Reuse one keep-alive connection pool across scrapes
+            self._session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=4,
+                max_retries=Retry(total=3, backoff_factor=0.3)
+            )
+            self._session.mount('https://', adapter)
+            self._session.mount('http://', adapter)
+        return self._session
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self) -> 'OctopusScraper':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
     def fetch_page_content(self) -> Optional[str]:
         """
@@ -28,15 +85,82 @@ class OctopusScraper:
         Returns:
             HTML content as string, or None if fetch fails
         """
+        import requests
+
         try:
-            response = requests.get(self.url, timeout=30)
-            response.raise_for_status()
-            logger.debug(f"Fetched page content: {len(response.text)} bytes")
-            return response.text
+            with self._get_session().get(self.url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                if response.encoding is None:
+                    response.encoding = 'utf-8'
+
+                content = ''
+                anchor_end = None
+                for chunk in response.iter_content(chunk_size=8192, decode_unicode=True):
+                    # Re-scan the tail of the previous chunks so anchors split
+                    # across a chunk boundary are still found
+                    scan_from = max(0, len(content) - _SCAN_OVERLAP)
+                    content += chunk
+
+                    if anchor_end is None:
+                        match = _NEXT_SESSIONS_RE.search(content, scan_from)
+                        if match:
+                            anchor_end = match.end()
+
+                    # Everything extract_sessions needs has arrived once the
+                    # heading that ends the "Next Sessions" section is seen
+                    if anchor_end is not None and _HEADING_RE.search(
+                        content, max(anchor_end, scan_from)
+                    ):
+                        logger.debug("Found end of sessions section, stopping download")
+                        break
+
+            logger.debug(f"Fetched page content: {len(content)} bytes")
+            return content
         except requests.RequestException as e:
             logger.error(f"Error fetching page: {e}")
             return None
 
+    def _html_to_text(self, block: str) -> str:
+        """
+        Flatten an HTML fragment to text, turning <br> into newlines.
+
+        Args:
+            block: HTML fragment
+
+        Returns:
+            Text content of the fragment
+        """
+        from lxml import html as lxml_html  # Deferred to keep startup fast
+
+        fragment = lxml_html.fragment_fromstring(block, create_parent='div')
+        for br in fragment.iter('br'):
+            br.tail = '\n' + (br.tail or '')
+        return fragment.text_content()
+
+    def _find_anchor(self, html_content: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Find the session section anchor and the offset just past it.
+
+        "Next Sessions:" takes priority over "Last Session:" wherever they
+        appear; both are found in a single scan with the combined anchor regex.
+
+        Args:
+            html_content: HTML content to search
+
+        Returns:
+            Tuple of (session_type, end offset), or (None, None) if not found
+        """
+        last_end = None
+        for match in _ANCHOR_RE.finditer(html_content):
+            if match.lastgroup == 'next':
+                return 'next', match.end()
+            if last_end is None:
+                last_end = match.end()
+
+        if last_end is not None:
+            return 'last', last_end
+        return None, None
+
     def extract_sessions(self, html_content: str) -> Tuple[Optional[str], List[str]]:
         """
         Extract session information from HTML content.
@@ -50,83 +174,41 @@ class OctopusScraper:
             sessions_list: List of session strings
         """
         sessions = []
-        session_type = None
 
-        # Try to find "Next Sessions:" first (for multiple)
-        match = re.search(r'Next\s+Sessions?:', html_content, re.IGNORECASE)
-        if match:
-            session_type = 'next'
-            start_pos = match.end()
+        # Find "Next Sessions:" (for multiple) or else "Last Session:"
+        session_type, start_pos = self._find_anchor(html_content)
+        if session_type == 'next':
             # Find the end of this section (next heading or double newline or end)
-            end_match = re.search(r'<h\d[^>]*>', html_content[start_pos:], re.IGNORECASE)
-            end_pos = end_match.start() if end_match else len(html_content) - start_pos
-            block = html_content[start_pos:start_pos + end_pos]
-
-            # Replace <br> with \n to handle line breaks
-            block = re.sub(r'<br\s*/?>', '\n', block, flags=re.IGNORECASE)
-            # Remove HTML tags
-            text_block = re.sub(r'<[^>]+>', '', block).strip()
-
-            # Split by newlines or common separators to avoid concatenation
-            potential_sessions = re.split(r'\n|Next|Power Tower', text_block)
-            for part in potential_sessions:
-                part = part.strip()
-                if part:
-                    # Use regex findall to extract valid session strings from each part
-                    found = re.findall(
-                        r'\d+(?:am|pm)?-\d+(?:am|pm)?,\s*\w+\s*\d+(?:st|nd|rd|th)?\s*\w+',
-                        part,
-                        re.IGNORECASE
-                    )
-                    sessions.extend(found)
+            end_match = _HEADING_RE.search(html_content, start_pos)
+            end_pos = end_match.start() if end_match else len(html_content)
+            block = html_content[start_pos:end_pos]
+            text_block = self._html_to_text(block).strip()
+
+            # Extract every session string in a single pass
+            sessions.extend(_find_sessions(text_block))
+        elif session_type == 'last':
+            # Find the end (next heading, "Next Power Tower", or end)
+            end_match = _LAST_END_RE.search(html_content, start_pos)
+            end_pos = end_match.start() if end_match else len(html_content)
+            block = html_content[start_pos:end_pos]
+            text_block = self._html_to_text(block).strip()
+
+            # Extract session string
+            found = _find_sessions(text_block)
+            sessions.extend(found)
         else:
-            # Check for "Last Session:"
-            match = re.search(r'Last\s+Session:', html_content, re.IGNORECASE)
+            # Fallback to old single session logic
+            match = _LEGACY_NEXT_RE.search(html_content)
             if match:
-                session_type = 'last'
-                start_pos = match.end()
-                # Find the end (next heading, "Next Power Tower", or end)
-                end_match = re.search(
-                    r'<h\d[^>]*>|Next Power Tower',
-                    html_content[start_pos:],
-                    re.IGNORECASE
-                )
-                end_pos = end_match.start() if end_match else len(html_content) - start_pos
-                block = html_content[start_pos:start_pos + end_pos]
-
-                # Replace <br> with \n
-                block = re.sub(r'<br\s*/?>', '\n', block, flags=re.IGNORECASE)
-                # Remove HTML tags
-                text_block = re.sub(r'<[^>]+>', '', block).strip()
-
-                # Extract session string
-                found = re.findall(
-                    r'\d+(?:am|pm)?-\d+(?:am|pm)?,\s*\w+\s*\d+(?:st|nd|rd|th)?\s*\w+',
-                    text_block,
-                    re.IGNORECASE
-                )
+                session_type = 'next'
+                session_raw = match.group(1).strip()
+                session_clean = _TAG_RE.sub('', session_raw)
+                # Split if multiple are concatenated
+                found = _find_sessions(session_clean)
                 sessions.extend(found)
-            else:
-                # Fallback to old single session logic
-                match = re.search(
-                    r'Next(?:\s+\w+)*\s+Sessions?:\s*([^<\n]+)',
-                    html_content,
-                    re.IGNORECASE
-                )
-                if match:
-                    session_type = 'next'
-                    session_raw = match.group(1).strip()
-                    session_clean = re.sub(r'<[^>]+>', '', session_raw)
-                    # Split if multiple are concatenated
-                    found = re.findall(
-                        r'\d+(?:am|pm)?-\d+(?:am|pm)?,\s*\w+\s*\d+(?:st|nd|rd|th)?\s*\w+',
-                        session_clean,
-                        re.IGNORECASE
-                    )
-                    sessions.extend(found)
-
-        # Remove duplicates and clean
-        sessions = list(set(sessions))
+
+        # Remove duplicates, keeping page order
+        sessions = list(dict.fromkeys(sessions))
         logger.info(f"Extracted {len(sessions)} session(s) (type: {session_type})")
 
         return session_type, sessions
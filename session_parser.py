@@ -2,13 +2,76 @@
 
 import re
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 
 
+__all__ = ['Session', 'SessionParser']
+
 logger = logging.getLogger(__name__)
 
+_TIME_RE = re.compile(r'(\d+)(am|pm)?', re.IGNORECASE)
+_AMPM_RE = re.compile(r'(am|pm)', re.IGNORECASE)
+_ORDINAL_SUFFIXES = frozenset(('st', 'nd', 'rd', 'th'))
+
+# 12-hour clock (marker, hour) -> 24-hour clock hour
+_HOUR24 = {
+    **{('am', h): (0 if h == 12 else h) for h in range(1, 13)},
+    **{('pm', h): (12 if h == 12 else h + 12) for h in range(1, 13)},
+}
+
+_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+_WEEKDAYS = frozenset((
+    'monday', 'tuesday', 'wednesday', 'thursday',
+    'friday', 'saturday', 'sunday',
+))
+
+
+def _split_date(date_str: str) -> Optional[Tuple[int, int]]:
+    """Split e.g. 'Saturday 4th October' into (month, day), or None if malformed."""
+    fields = date_str.split()
+    if len(fields) != 3:
+        return None
+    weekday, day, month = fields
+    # Remove ordinal suffix from the day
+    if day[-2:].lower() in _ORDINAL_SUFFIXES:
+        day = day[:-2]
+    month_num = _MONTHS.get(month.lower())
+    if month_num is None or weekday.lower() not in _WEEKDAYS:
+        return None
+    if not day.isdigit() or len(day) > 2:
+        return None
+    return month_num, int(day)
+
+
+@lru_cache(maxsize=256)
+def _parse_date_only(date_part: str, year: int) -> Optional[date]:
+    """Parse e.g. 'Saturday 4th October' in the given year, or None if invalid."""
+    fields = _split_date(date_part)
+    if fields is None:
+        return None
+    month, day = fields
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def _fmt_long(dt: datetime) -> str:
+    """Format a datetime as e.g. 'Saturday, 04 October 2025 at 12:00 PM'."""
+    return dt.strftime('%A, %d %B %Y at %I:%M %p')
+
+
+def _fmt_short(dt: datetime) -> str:
+    """Format a datetime as e.g. '02:00 PM'."""
+    return dt.strftime('%I:%M %p')
+
 
 @dataclass
 class Session:
@@ -23,6 +86,16 @@ class Session:
         """Get session duration."""
         return self.end_time - self.start_time
 
+    @cached_property
+    def start_long(self) -> str:
+        """Get formatted start date and time (cached)."""
+        return _fmt_long(self.start_time)
+
+    @cached_property
+    def end_short(self) -> str:
+        """Get formatted end time (cached)."""
+        return _fmt_short(self.end_time)
+
 
 class SessionParser:
     """Parser for session strings like '12-2pm, Saturday 4th October'."""
@@ -36,12 +109,14 @@ class SessionParser:
         """
         self.timezone = timezone
 
-    def parse(self, session_str: str) -> Optional[Session]:
+    def parse(self, session_str: str, now: Optional[datetime] = None) -> Optional[Session]:
         """
         Parse a session string to extract start and end times.
 
         Args:
             session_str: Session string (e.g., '12-2pm, Saturday 4th October')
+            now: Current time, so a batch of sessions can share one clock read
+                (defaults to datetime.now())
 
         Returns:
             Session object or None if parsing fails
@@ -54,105 +129,105 @@ class SessionParser:
         time_part = parts[0].strip()  # e.g., '12-2pm'
         date_part = parts[1].strip()  # e.g., 'Saturday 4th October'
 
-        # Parse times
-        start_time = self._parse_start_time(time_part, date_part)
-        end_time = self._parse_end_time(time_part, date_part)
+        # Split the time range once
+        if '-' not in time_part:
+            logger.warning(f"Invalid time range in session: {session_str}")
+            return None
+        start_str, end_str = time_part.split('-', 1)
+
+        if now is None:
+            now = datetime.now()
+
+        # Parse the date once and combine it with both times
+        date_obj = self._parse_date(date_part, now.year)
+        if date_obj is None:
+            logger.warning(f"Failed to parse times for session: {session_str}")
+            return None
+
+        start_time = self._combine(date_obj, start_str.strip(), time_part)
+        end_time = self._combine(date_obj, end_str.strip(), time_part)
 
         if start_time is None or end_time is None:
             logger.warning(f"Failed to parse times for session: {session_str}")
             return None
 
+        # If the session has already ended, it refers to next year's date
+        # (kept as-is if the date doesn't exist next year)
+        if end_time < now:
+            next_date = _parse_date_only(date_part, now.year + 1)
+            if next_date is not None:
+                start_time = datetime.combine(next_date, start_time.time())
+                end_time = datetime.combine(next_date, end_time.time())
+
         return Session(
             session_str=session_str,
             start_time=start_time,
             end_time=end_time
         )
 
-    def _parse_start_time(self, time_part: str, date_part: str) -> Optional[datetime]:
-        """Parse start time from session string."""
-        # Extract start time (before the dash)
-        start_time_str = time_part.split('-')[0].strip()
-        return self._parse_datetime(start_time_str, date_part, time_part)
+    def _parse_date(self, date_part: str, current_year: int) -> Optional[date]:
+        """
+        Parse a date string.
 
-    def _parse_end_time(self, time_part: str, date_part: str) -> Optional[datetime]:
-        """Parse end time from session string."""
-        # Extract end time (after the dash)
-        end_time_str = time_part.split('-')[1].strip()
-        return self._parse_datetime(end_time_str, date_part, time_part)
+        Args:
+            date_part: Date string (e.g., 'Saturday 4th October')
+            current_year: Year to try first
 
-    def _parse_datetime(self, time_str: str, date_part: str, full_time_range: Optional[str] = None) -> Optional[datetime]:
+        Returns:
+            date in the current year (or next year if the date doesn't exist
+            this year), or None if parsing fails
         """
-        Parse a datetime from time and date strings.
+        # Try next year if the date is invalid this year (e.g. 29 February)
+        date_obj = (_parse_date_only(date_part, current_year)
+                    or _parse_date_only(date_part, current_year + 1))
+        if date_obj is None:
+            logger.error(f"Failed to parse date: {date_part}")
+        return date_obj
+
+    def _combine(self, date_obj: date, time_str: str, full_time_range: Optional[str] = None) -> Optional[datetime]:
+        """
+        Combine a parsed date with a time string.
 
         Args:
+            date_obj: Parsed date
             time_str: Time string (e.g., '12pm' or '2pm')
-            date_part: Date string (e.g., 'Saturday 4th October')
             full_time_range: Full time range string (e.g., '9-10pm') to infer AM/PM
 
         Returns:
             datetime object or None if parsing fails
         """
         # Parse time
-        match = re.match(r'(\d+)(am|pm)?', time_str.lower())
+        match = _TIME_RE.match(time_str)
         if not match:
             return None
 
         hour = int(match.group(1))
         ampm = match.group(2)
+        if ampm:
+            ampm = ampm.lower()
 
         # If no AM/PM marker on this time, try to infer from the full time range
         if not ampm and full_time_range:
-            range_match = re.search(r'(am|pm)', full_time_range.lower())
+            range_match = _AMPM_RE.search(full_time_range)
             if range_match:
-                ampm = range_match.group(1)
+                ampm = range_match.group(1).lower()
 
         # Default to AM if still no marker (except for 12 which defaults to PM)
         if not ampm:
             ampm = 'pm' if hour == 12 else 'am'
 
-        # Convert to 24-hour format
-        if ampm == 'pm' and hour != 12:
-            hour += 12
-        elif ampm == 'am' and hour == 12:
-            hour = 0
+        # Convert to 24-hour format (hours outside 1-12 are shifted for PM only)
+        hour = _HOUR24.get((ampm, hour), hour + 12 if ampm == 'pm' else hour)
 
         minute = 0  # Assume on the hour
 
-        # Parse date
-        # Remove ordinal suffix from date
-        date_part_clean = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', date_part, flags=re.IGNORECASE)
-
-        # Get current year and try to parse
-        current_year = datetime.now().year
-        date_str_full = f"{date_part_clean} {current_year}"
-
         try:
-            date_obj = datetime.strptime(date_str_full, '%A %d %B %Y')
+            return datetime.combine(date_obj, time(hour, minute))
         except ValueError:
-            # Try next year if the date is in the past
-            try:
-                date_str_full = f"{date_part_clean} {current_year + 1}"
-                date_obj = datetime.strptime(date_str_full, '%A %d %B %Y')
-            except ValueError:
-                logger.error(f"Failed to parse date: {date_part}")
-                return None
-
-        # Combine into datetime
-        result = date_obj.replace(hour=hour, minute=minute)
-
-        # If the datetime is in the past, try next year
-        if result < datetime.now():
-            try:
-                date_str_full = f"{date_part_clean} {current_year + 1}"
-                date_obj = datetime.strptime(date_str_full, '%A %d %B %Y')
-                result = date_obj.replace(hour=hour, minute=minute)
-            except ValueError:
-                pass
-
-        return result
+            return None
 
     def get_upcoming_notification_time(
-        self, session: Session, hours_before: int
+        self, session: Session, hours_before: int, now: Optional[datetime] = None
     ) -> Optional[datetime]:
         """
         Get the time for upcoming notification.
@@ -160,11 +235,12 @@ class SessionParser:
         Args:
             session: Session object
             hours_before: Hours before session to notify
+            now: Current time (defaults to datetime.now())
 
         Returns:
             datetime for notification or None if already passed
         """
         notification_time = session.start_time - timedelta(hours=hours_before)
-        if notification_time <= datetime.now():
+        if notification_time <= (now or datetime.now()):
             return None
         return notification_time